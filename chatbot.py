@@ -5,43 +5,73 @@ A RAG-based chatbot for answering questions about CSE courses.
 Implements Strategy, Chain of Responsibility, and Adapter patterns.
 """
 
-import json
-from typing import List
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import List, Optional
 
-from models import Course
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from cache import SmartRAGCache, SemanticCache
+from embedding_cache import EmbeddingCache
+from local_store import LocalContentStore
+from models import Course, CourseCatalog, QueryContext
+from ollama_client import PooledAccessOllama
 from strategies import (
     TopNStrategy, WindowStrategy, DocumentStrategy, HierarchicalStrategy
 )
 from handlers import CourseIdHandler, CourseTitleHandler, SemanticHandler
 from providers import OllamaProvider, OpenAIProvider, GeminiProvider
 
-from rag4p.integrations.ollama.access_ollama import AccessOllama
 from rag4p.integrations.ollama.ollama_embedder import OllamaEmbedder
-from rag4p.rag.store.local.internal_content_store import InternalContentStore
 from rag4p.rag.model.chunk import Chunk
 
+EMBEDDING_MODEL = "nomic-embed-text"
+
 
 class CSEChatbot:
     """Main chatbot controller orchestrating all components."""
     
-    def __init__(self, data_path: str = "courses.jsonl"):
-        self._courses = self._load_courses(data_path)
+    def __init__(self, data_path: str = "courses.jsonl",
+                 embed_batch_size: int = 32,
+                 embedding_cache_path: Optional[str] = None,
+                 quantize_embeddings: bool = True,
+                 warm_up: bool = True):
+        self._embed_batch_size = embed_batch_size
+        self._quantize_embeddings = quantize_embeddings
+        self._warm_up_enabled = warm_up
+        self._embedding_cache_path = embedding_cache_path or os.path.join(
+            os.path.dirname(os.path.abspath(data_path)), ".emb_cache.sqlite"
+        )
+        self._catalog = CourseCatalog(self._load_courses(data_path))
         
         self._init_rag_components()
         self._index_courses()
         
         self.strategy = TopNStrategy()
         self.provider = OllamaProvider()
+        self._cache = SmartRAGCache()
+        self._semantic_cache = SemanticCache()
+        self._executor = ThreadPoolExecutor(max_workers=2)
         
         self._build_handler_chain()
+        
+        if warm_up:
+            self._warm_up()
     
     def _load_courses(self, path: str) -> List[Course]:
         """Load course data from JSONL file."""
         courses = []
         try:
-            with open(path, 'r') as f:
+            with open(path, 'rb') as f:
                 for line in f:
-                    data = json.loads(line.strip())
+                    if line.isspace():
+                        continue
+                    data = json_loads(line)
                     courses.append(Course(
                         id=data['id'],
                         title=data['title'],
@@ -52,47 +82,111 @@ class CSEChatbot:
         return courses
     
     def _init_rag_components(self):
-        """Initialize RAG components (embedder, content store)."""
+        """Initialize RAG components (embedder)."""
         print("Initializing RAG components...")
-        self._ollama = AccessOllama(host="localhost", port=11434)
+        self._ollama = PooledAccessOllama(host="localhost", port=11434)
         self._embedder = OllamaEmbedder(
             access_ollama=self._ollama, 
-            model="nomic-embed-text"
+            model=EMBEDDING_MODEL
         )
-        self._store = InternalContentStore(embedder=self._embedder)
+    
+    def _batch_embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batches via Ollama's /api/embed endpoint.
+        
+        Falls back to one /api/embeddings call per text when the server
+        does not return an `embeddings` list (older Ollama versions).
+        """
+        embeddings = []
+        for start in range(0, len(texts), self._embed_batch_size):
+            batch = texts[start:start + self._embed_batch_size]
+            batch_embeddings = self._ollama.generate_embeddings(
+                batch, EMBEDDING_MODEL
+            )
+            if batch_embeddings is None:
+                batch_embeddings = [self._embedder.embed(text) for text in batch]
+            embeddings.extend(batch_embeddings)
+        return embeddings
+    
+    def _cached_embed(self, texts: List[str]) -> list:
+        """Embed texts, reusing vectors from the persistent cache."""
+        try:
+            with closing(EmbeddingCache(self._embedding_cache_path)) as cache:
+                vectors, misses = cache.get_or_embed(
+                    EMBEDDING_MODEL, texts, self._batch_embed
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: embedding cache unavailable: {e}")
+            return self._batch_embed(texts)
+        print(f"Embedding cache: {len(texts) - misses} hits, {misses} misses.")
+        return vectors
     
     def _index_courses(self):
         """Index course documents for semantic search."""
         print("Indexing courses...")
-        chunks = []
-        for course in self._courses:
-            chunk = Chunk(
-                document_id=course.id,
+        catalog = self._catalog
+        texts = [
+            f"{title}: {description}"
+            for title, description in zip(catalog.titles, catalog.descriptions)
+        ]
+        embeddings = self._cached_embed(texts)
+        chunks = [
+            Chunk(
+                document_id=catalog.ids[idx],
                 chunk_id="0",
                 total_chunks=1,
-                chunk_text=f"{course.title}: {course.description}",
-                properties={"title": course.title, "id": course.id}
+                chunk_text=text,
+                properties={"title": catalog.titles[idx], "id": catalog.ids[idx]}
             )
-            chunks.append(chunk)
-        self._store.store(chunks)
+            for idx, text in enumerate(texts)
+        ]
+        self._store = LocalContentStore(
+            self._embedder, chunks, embeddings,
+            quantize=self._quantize_embeddings
+        )
         print("Indexing complete.")
     
     def _build_handler_chain(self):
         """Build the Chain of Responsibility."""
         self._semantic_handler = SemanticHandler(
-            courses=self._courses,
+            catalog=self._catalog,
             strategy=self.strategy,
-            provider=self.provider
+            provider=self.provider,
+            embedder=self._embedder,
+            semantic_cache=self._semantic_cache
         )
         self._title_handler = CourseTitleHandler(
             successor=self._semantic_handler,
-            courses=self._courses
+            catalog=self._catalog
         )
         self._handler_chain = CourseIdHandler(
             successor=self._title_handler,
-            courses=self._courses
+            catalog=self._catalog
         )
     
+    def close(self):
+        """Stop background work; pending embedding prefetches are cancelled."""
+        self._executor.shutdown(cancel_futures=True)
+    
+    def _warm_up(self):
+        """Pay first-query setup costs (JIT, model loads) during startup."""
+        print("Warming up...")
+        try:
+            self._store.warm_up()
+        except Exception as e:
+            print(f"Warning: retrieval warm-up failed: {e}")
+        try:
+            self._embedder.embed("warmup")
+        except Exception as e:
+            print(f"Warning: embedder warm-up failed: {e}")
+        self._warm_up_provider()
+    
+    def _warm_up_provider(self):
+        """Load the current provider's model ahead of its first question."""
+        try:
+            self.provider.warm_up()
+        except Exception as e:
+            print(f"Warning: provider warm-up failed: {e}")
+    
     def set_strategy(self, strategy_name: str):
         """Change retrieval strategy at runtime (Strategy Pattern)."""
         strategies = {
@@ -104,6 +198,8 @@ class CSEChatbot:
         if strategy_name in strategies:
             self.strategy = strategies[strategy_name]()
             self._semantic_handler.strategy = self.strategy
+            self._cache.clear()
+            self._semantic_cache.clear()
             print(f"Strategy changed to: {strategy_name}")
         else:
             print(f"Unknown strategy: {strategy_name}")
@@ -118,13 +214,31 @@ class CSEChatbot:
         if provider_name in providers:
             self.provider = providers[provider_name]()
             self._semantic_handler.provider = self.provider
+            self._cache.clear()
+            self._semantic_cache.clear()
+            if self._warm_up_enabled:
+                self._warm_up_provider()
             print(f"Provider changed to: {provider_name}")
         else:
             print(f"Unknown provider: {provider_name}")
     
     def ask(self, question: str) -> str:
-        """Process a user question through the handler chain."""
-        return self._handler_chain.handle(question, self._store)
+        """Process a user question through the handler chain.
+        
+        The query embedding for the semantic handler is fetched in the
+        background while the cheap ID and title handlers run, and is
+        discarded if either of them answers.
+        """
+        key = " ".join(question.lower().split())
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        ctx = QueryContext(question, self._store)
+        ctx.prefetch = self._executor.submit(self._embedder.embed, question)
+        response = self._handler_chain.handle(ctx)
+        ctx.prefetch.cancel()
+        self._cache.put(key, response)
+        return response
 
 
 def main():
@@ -162,6 +276,8 @@ def main():
         except KeyboardInterrupt:
             print("\nGoodbye!")
             break
+    
+    chatbot.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Persistent embedding cache for the CSE Chatbot.
+
+Embeddings are stored in SQLite keyed by sha256(model + ":" + text), so
+unchanged course texts are not re-embedded across restarts and a model
+change naturally misses the cache.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """SQLite-backed store of embedding vectors keyed by content hash."""
+
+    def __init__(self, path: str = ".emb_cache.sqlite"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb("
+            "key TEXT PRIMARY KEY, model TEXT, vec BLOB)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Return the cache key for text embedded with model."""
+        return hashlib.sha256(f"{model}:{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever keys are present."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT vec FROM emb WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    found[key] = np.frombuffer(row[0], dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, items: List[Tuple[str, Sequence[float]]]):
+        """Persist (key, vector) pairs computed with model."""
+        rows = [
+            (key, model, np.asarray(vec, dtype=np.float32).tobytes())
+            for key, vec in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb(key, model, vec) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def get_or_embed(self, model: str, texts: List[str],
+                     embed: Callable[[List[str]], list]
+                     ) -> Tuple[List[np.ndarray], int]:
+        """Return vectors for texts, calling embed only for cache misses.
+
+        Returns (vectors in input order, number of misses).
+        """
+        keys = [self.key(model, text) for text in texts]
+        found = self.get_many(keys)
+        misses = [i for i, key in enumerate(keys) if key not in found]
+        if misses:
+            new_vectors = embed([texts[i] for i in misses])
+            if len(new_vectors) != len(misses):
+                raise ValueError(
+                    f"Embedder returned {len(new_vectors)} vectors "
+                    f"for {len(misses)} texts"
+                )
+            new_items = [(keys[i], vec) for i, vec in zip(misses, new_vectors)]
+            self.put_many(model, new_items)
+            found.update(
+                (key, np.asarray(vec, dtype=np.float32)) for key, vec in new_items
+            )
+        return [found[key] for key in keys], len(misses)
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,69 @@
+"""
+Numba-compiled similarity kernels for the CSE Chatbot.
+
+Used by LocalContentStore's float32 path when simsimd is not installed.
+Rows of the corpus matrix are unit-normalized at index time, so cosine
+similarity reduces to a dot product. The query (1D) and corpus (2D)
+paths are kept as separate functions for Numba type stability.
+
+Numba is optional: without it NUMBA_AVAILABLE is False and callers fall
+back to numpy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(fastmath=True, cache=True)
+    def normalize(v):
+        """Return v scaled to unit length (unchanged if zero)."""
+        norm = np.sqrt(np.sum(v * v))
+        if norm == 0.0:
+            return v.copy()
+        return v / norm
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def cosine_scores(q, M, out_score):
+        """Write the dot product of q with each row of M into out_score."""
+        K, D = M.shape
+        for i in prange(K):
+            s = 0.0
+            for d in range(D):
+                s += q[d] * M[i, d]
+            out_score[i] = s
+
+    @njit(fastmath=True, cache=True)
+    def cosine_topn(q, M, n, out_idx, out_score):
+        """Score every row of M against q and write the best n indices.
+        
+        Selection keeps a sorted buffer of n candidates (O(K * n)) instead
+        of sorting all K scores.
+        """
+        cosine_scores(q, M, out_score)
+        # Finite sentinel: fastmath assumes no infinities.
+        best = np.full(n, np.finfo(np.float32).min, dtype=np.float32)
+        for i in range(out_score.shape[0]):
+            s = out_score[i]
+            if s <= best[n - 1]:
+                continue
+            j = n - 1
+            while j > 0 and best[j - 1] < s:
+                best[j] = best[j - 1]
+                out_idx[j] = out_idx[j - 1]
+                j -= 1
+            best[j] = s
+            out_idx[j] = i
+
+    def warmup():
+        """Compile the kernels for float32 inputs ahead of the first query."""
+        q = normalize(np.ones(2, dtype=np.float32))
+        M = np.ones((2, 2), dtype=np.float32)
+        cosine_topn(q, M, 1, np.empty(1, dtype=np.int64),
+                    np.empty(2, dtype=np.float32))
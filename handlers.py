@@ -9,29 +9,31 @@ Handlers process queries in sequence:
 
 import re
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional
 
-from models import Course
+from models import CourseCatalog, QueryContext
+
+_COURSE_ID_RE = re.compile(r'\b([1-4]\d{3})\b', re.ASCII)
 
 
 class QueryHandler(ABC):
     """Abstract base class for query handlers in the chain."""
     
-    def __init__(self, successor=None, courses: List[Course] = None):
+    def __init__(self, successor=None, catalog: CourseCatalog = None):
         self._successor = successor
-        self._courses = courses or []
+        self._catalog = catalog or CourseCatalog([])
     
-    def handle(self, query: str, content_store=None) -> str:
+    def handle(self, ctx: QueryContext) -> str:
         """Process query or pass to successor."""
-        result = self._process(query, content_store)
+        result = self._process(ctx)
         if result:
             return result
         if self._successor:
-            return self._successor.handle(query, content_store)
+            return self._successor.handle(ctx)
         return "Sorry, I couldn't find an answer to your question."
     
     @abstractmethod
-    def _process(self, query: str, content_store) -> Optional[str]:
+    def _process(self, ctx: QueryContext) -> Optional[str]:
         """Process the query. Return None to pass to next handler."""
         pass
 
@@ -39,44 +41,74 @@ class QueryHandler(ABC):
 class CourseIdHandler(QueryHandler):
     """Handles queries containing course IDs (4-digit numbers 1000-4999)."""
     
-    def _process(self, query: str, content_store) -> Optional[str]:
-        match = re.search(r'\b([1-4]\d{3})\b', query)
+    def _process(self, ctx: QueryContext) -> Optional[str]:
+        match = _COURSE_ID_RE.search(ctx.query)
         if match:
-            course_id = match.group(1)
-            for course in self._courses:
-                if course.id == course_id:
-                    return (
-                        f"Course {course.id}: {course.title}. "
-                        f"Description: {course.description}"
-                    )
+            idx = self._catalog.id_to_idx.get(match.group(1))
+            if idx is not None:
+                return (
+                    f"Course {self._catalog.ids[idx]}: {self._catalog.titles[idx]}. "
+                    f"Description: {self._catalog.descriptions[idx]}"
+                )
         return None
 
 
 class CourseTitleHandler(QueryHandler):
-    """Handles queries containing exact course titles."""
+    """Handles queries containing exact course titles.
     
-    def _process(self, query: str, content_store) -> Optional[str]:
-        query_lower = query.lower()
-        for course in self._courses:
-            if course.title.lower() in query_lower:
-                return (
-                    f"Found course by title: {course.title}. "
-                    f"ID: {course.id}. Description: {course.description}"
-                )
+    Titles are combined into one compiled regex alternation (longest
+    first, so the longest title wins), so a query is scanned in a single
+    C-level pass regardless of catalog size.
+    """
+    
+    def __init__(self, successor=None, catalog: CourseCatalog = None):
+        super().__init__(successor, catalog)
+        self._title_to_idx = {}
+        for idx, title_lower in enumerate(self._catalog.titles_lower):
+            self._title_to_idx.setdefault(title_lower, idx)
+        titles = sorted(self._title_to_idx, key=len, reverse=True)
+        self._title_re = (
+            re.compile('|'.join(re.escape(t) for t in titles)) if titles else None
+        )
+    
+    def _process(self, ctx: QueryContext) -> Optional[str]:
+        if self._title_re is None:
+            return None
+        match = self._title_re.search(ctx.query.lower())
+        if match:
+            idx = self._title_to_idx[match.group(0)]
+            return (
+                f"Found course by title: {self._catalog.titles[idx]}. "
+                f"ID: {self._catalog.ids[idx]}. "
+                f"Description: {self._catalog.descriptions[idx]}"
+            )
         return None
 
 
 class SemanticHandler(QueryHandler):
     """Handles semantic queries using RAG (retrieval + LLM generation)."""
     
-    def __init__(self, successor=None, courses: List[Course] = None, 
-                 strategy=None, provider=None):
-        super().__init__(successor, courses)
+    def __init__(self, successor=None, catalog: CourseCatalog = None, 
+                 strategy=None, provider=None, embedder=None,
+                 semantic_cache=None):
+        super().__init__(successor, catalog)
         self.strategy = strategy
         self.provider = provider
+        self._embedder = embedder
+        self._semantic_cache = semantic_cache
     
-    def _process(self, query: str, content_store) -> Optional[str]:
-        if self.strategy and self.provider and content_store:
-            context = self.strategy.retrieve(query, content_store)
-            return self.provider.generate_answer(query, context)
+    def _process(self, ctx: QueryContext) -> Optional[str]:
+        if self.strategy and self.provider and ctx.content_store:
+            embedding = None
+            if self._embedder:
+                embedding = ctx.get_embedding(self._embedder)
+            if embedding is not None and self._semantic_cache:
+                cached = self._semantic_cache.get(embedding)
+                if cached is not None:
+                    return cached
+            context = self.strategy.retrieve(ctx)
+            answer = self.provider.generate_answer(ctx.query, context)
+            if embedding is not None and self._semantic_cache and answer:
+                self._semantic_cache.put(embedding, answer)
+            return answer
         return None
@@ -0,0 +1,130 @@
+"""
+In-process content store for the CSE Chatbot.
+
+Holds all chunk embeddings in a single float32 matrix and scores a query
+against the whole corpus in one vectorized call (SIMD via simsimd when
+installed, a Numba kernel or numpy otherwise), instead of rag4p's
+per-row Python loop.
+By default the matrix is quantized to int8 with a symmetric per-vector
+scale, cutting its memory 4x; pass `quantize=False` for the float32 path.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from rag4p.rag.model.chunk import Chunk
+from rag4p.rag.model.relevant_chunk import RelevantChunk
+
+import fast_sim
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+
+class LocalContentStore:
+    """Content store adapter exposing rag4p's `find_relevant_chunks`."""
+
+    def __init__(self, embedder, chunks: List[Chunk],
+                 embeddings: Sequence[Sequence[float]], quantize: bool = True):
+        self._embedder = embedder
+        self._quantize = quantize
+        self._chunks = list(chunks)
+        self._chunk_texts = [chunk.chunk_text for chunk in self._chunks]
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        matrix = matrix.reshape(len(self._chunks), -1 if self._chunks else 0)
+        # Rows are unit-normalized so cosine similarity is a dot product.
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._emb_matrix = matrix / np.where(norms == 0, 1, norms)
+        if quantize:
+            self._emb_i8 = _quantize_i8(self._emb_matrix)
+            self._i8_norms = np.linalg.norm(
+                self._emb_i8.astype(np.float32), axis=1
+            )
+            self._emb_matrix = None
+
+    def warm_up(self):
+        """JIT-compile the Numba kernels if this store will use them."""
+        if self._uses_numba():
+            fast_sim.warmup()
+
+    def find_relevant_chunks(self, query: str, max_results: int = 4,
+                             embedding: Sequence[float] = None
+                             ) -> List[RelevantChunk]:
+        """Return the max_results chunks most cosine-similar to query.
+        
+        A precomputed query embedding may be passed to skip embedding.
+        """
+        if embedding is None:
+            embedding = self._embedder.embed(query)
+        top, scores = self._top_n(embedding, max_results)
+        relevant_chunks = []
+        for idx in top:
+            chunk = self._chunks[idx]
+            relevant_chunks.append(RelevantChunk(
+                document_id=chunk.document_id,
+                chunk_id=chunk.chunk_id,
+                total_chunks=chunk.total_chunks,
+                text=chunk.chunk_text,
+                properties=chunk.properties,
+                score=float(scores[idx])
+            ))
+        return relevant_chunks
+
+    def retrieve_context_text(self, query: str, n: int,
+                              embedding: Sequence[float] = None) -> str:
+        """Return the texts of the n most similar chunks joined by newlines.
+        
+        Skips building RelevantChunk objects when only the text is needed.
+        """
+        if embedding is None:
+            embedding = self._embedder.embed(query)
+        top, _ = self._top_n(embedding, n)
+        return "\n".join(self._chunk_texts[idx] for idx in top)
+
+    def _top_n(self, embedding: Sequence[float], n: int):
+        """Return (indices sorted by similarity, similarity per chunk)."""
+        if not self._chunks or n <= 0:
+            return [], np.empty(0, dtype=np.float32)
+        query = np.asarray(embedding, dtype=np.float32)
+        n = min(n, len(self._chunks))
+        if self._uses_numba():
+            top = np.empty(n, dtype=np.int64)
+            scores = np.empty(len(self._chunks), dtype=np.float32)
+            fast_sim.cosine_topn(fast_sim.normalize(query), self._emb_matrix,
+                                 n, top, scores)
+            return top, scores
+        scores = self._scores(query)
+        top = np.argpartition(-scores, n - 1)[:n]
+        return top[np.argsort(-scores[top])], scores
+
+    def _uses_numba(self) -> bool:
+        return not self._quantize and simsimd is None and fast_sim.NUMBA_AVAILABLE
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        if self._quantize:
+            return self._scores_i8(_quantize_i8(query[None, :]))
+        if simsimd is not None:
+            distances = simsimd.cdist(query[None, :], self._emb_matrix,
+                                      metric="cos")
+            return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+        norm = np.linalg.norm(query)
+        return self._emb_matrix @ (query / norm if norm else query)
+
+    def _scores_i8(self, query_i8: np.ndarray) -> np.ndarray:
+        if simsimd is not None:
+            distances = simsimd.cdist(query_i8, self._emb_i8, metric="cosine")
+            return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+        # Accumulate in int32 without materializing an int32 copy of the matrix.
+        dots = np.einsum("ij,j->i", self._emb_i8, query_i8[0], dtype=np.int32)
+        norms = self._i8_norms * np.linalg.norm(query_i8.astype(np.float32))
+        return dots / np.where(norms == 0, 1, norms)
+
+
+def _quantize_i8(matrix: np.ndarray) -> np.ndarray:
+    """Quantize rows to int8 with a symmetric per-row scale."""
+    scales = np.max(np.abs(matrix), axis=1, keepdims=True, initial=0) / 127.0
+    scales = np.where(scales == 0, 1, scales)
+    return np.round(matrix / scales).astype(np.int8)
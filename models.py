@@ -1,12 +1,59 @@
-"""Course data model for the CSE Chatbot."""
+"""Data model for the CSE Chatbot: courses, the catalog and query context."""
 
+from concurrent.futures import Future
 from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Course:
     """Represents a course in the CSE catalog."""
     
     id: str
     title: str
     description: str
+
+
+class CourseCatalog:
+    """Struct-of-arrays view of the course catalog.
+    
+    Fields are stored as parallel tuples (with titles pre-lowercased) so
+    handlers can look courses up without per-query allocations.
+    """
+    
+    def __init__(self, courses: List[Course]):
+        self.ids: Tuple[str, ...] = tuple(c.id for c in courses)
+        self.titles: Tuple[str, ...] = tuple(c.title for c in courses)
+        self.titles_lower: Tuple[str, ...] = tuple(t.lower() for t in self.titles)
+        self.descriptions: Tuple[str, ...] = tuple(c.description for c in courses)
+        self.id_to_idx: Dict[str, int] = {cid: i for i, cid in enumerate(self.ids)}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class QueryContext:
+    """Per-question state passed along the handler chain.
+    
+    Memoizes the query embedding so the semantic cache and the retrieval
+    strategy share a single embedding call.
+    """
+    
+    query: str
+    content_store: Any = None
+    embedding: Optional[Sequence[float]] = None
+    prefetch: Optional[Future] = None
+    
+    def get_embedding(self, embedder=None) -> Optional[Sequence[float]]:
+        """Return the query embedding, computing it at most once.
+        
+        Uses the prefetched embedding when there is one; without a
+        prefetch or an embedder, returns None.
+        """
+        if self.embedding is None:
+            if self.prefetch is not None:
+                self.embedding = self.prefetch.result()
+            elif embedder is not None:
+                self.embedding = embedder.embed(self.query)
+        return self.embedding
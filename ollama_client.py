@@ -0,0 +1,94 @@
+"""
+Pooled HTTP access to the Ollama server.
+
+rag4p's AccessOllama calls `requests.post` directly, opening a new
+connection per request. PooledAccessOllama keeps the same interface but
+sends every call through one keep-alive `requests.Session`.
+"""
+
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rag4p.integrations.ollama.access_ollama import AccessOllama
+
+
+def create_session(pool_connections: int = 4,
+                   pool_maxsize: int = 16) -> requests.Session:
+    """Create a keep-alive session with a connection pool and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+class PooledAccessOllama(AccessOllama):
+    """AccessOllama that reuses a pooled HTTP session for every call."""
+
+    def __init__(self, host: str = "localhost", port: int = 11434,
+                 protocol: str = "http", session: requests.Session = None):
+        super().__init__(host=host, port=port, protocol=protocol)
+        self.session = session or create_session()
+
+    def list_models(self) -> List[str]:
+        response = self.session.get(f"{self.connection}/api/tags")
+        models = []
+        if response.status_code == 200:
+            for model in response.json()["models"]:
+                models.append(f"{model['name']} ( "
+                              f"{model['details']['parameter_size']} - "
+                              f"{model['details']['quantization_level']} )")
+        return models
+
+    def generate_answer(self, prompt: str, model: str) -> str:
+        response = self.session.post(f"{self.connection}/api/generate",
+                                     json={
+                                         "prompt": prompt,
+                                         "model": model,
+                                         "format": "json",
+                                         "stream": False
+                                     })
+        if response.status_code == 200:
+            return response.json()["response"]
+        raise Exception("Error generating answer:" + response.text)
+
+    def generate_embedding(self, text: str, model: str) -> List[float]:
+        response = self.session.post(f"{self.connection}/api/embeddings",
+                                     json={"model": model, "prompt": text})
+        if response.status_code == 200:
+            return response.json()["embedding"]
+        raise Exception("Error generating embedding:" + response.text)
+
+    def generate_embeddings(self, texts: List[str],
+                            model: str) -> Optional[List[List[float]]]:
+        """Embed texts in one /api/embed call.
+
+        Returns None when the server does not support batch embedding.
+        """
+        response = self.session.post(f"{self.connection}/api/embed",
+                                     json={"model": model, "input": texts},
+                                     timeout=60)
+        if response.status_code == 200:
+            return response.json().get("embeddings")
+        return None
+
+    def load_model(self, model: str, timeout: float = 60) -> bool:
+        """Load model into server memory ahead of the first real request.
+
+        Returns False if the model is not available on the server.
+        """
+        response = self.session.post(f"{self.connection}/api/show",
+                                     json={"model": model}, timeout=timeout)
+        if response.status_code != 200:
+            return False
+        response = self.session.post(f"{self.connection}/api/generate",
+                                     json={"model": model}, timeout=timeout)
+        return response.status_code == 200
@@ -9,16 +9,21 @@ Provides a unified interface for different LLM backends:
 
 from abc import ABC, abstractmethod
 
-from rag4p.integrations.ollama.access_ollama import AccessOllama
 from rag4p.integrations.ollama.ollama_answer_generator import OllamaAnswerGenerator
 
+from ollama_client import PooledAccessOllama
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
     @abstractmethod
-    def generate_answer(self, question: str, context) -> str:
-        """Generate an answer given a question and context."""
+    def generate_answer(self, question: str, context_text: str) -> str:
+        """Generate an answer given a question and pre-joined context text."""
+        pass
+    
+    def warm_up(self):
+        """Prepare the backend so the first question is not slower."""
         pass
 
 
@@ -26,30 +31,28 @@ class OllamaProvider(LLMProvider):
     """Adapter for local Ollama LLM."""
     
     def __init__(self, model: str = "phi3", host: str = "localhost", port: int = 11434):
-        self.access = AccessOllama(host=host, port=port)
+        self.access = PooledAccessOllama(host=host, port=port)
         self.generator = OllamaAnswerGenerator(access_ollama=self.access, model=model)
     
-    def generate_answer(self, question: str, context) -> str:
-        if isinstance(context, list):
-            context_text = "\n".join([chunk.chunk_text for chunk in context])
-        else:
-            context_text = str(context)
-        
+    def generate_answer(self, question: str, context_text: str) -> str:
         answer = self.generator.generate_answer(question, context_text)
         return f"[Ollama] {answer}"
+    
+    def warm_up(self):
+        self.access.load_model(self.generator.model)
 
 
 class OpenAIProvider(LLMProvider):
     """Adapter for OpenAI API (simulated for demonstration)."""
     
-    def generate_answer(self, question: str, context) -> str:
-        context_preview = str(context)[:100] if context else "No context"
+    def generate_answer(self, question: str, context_text: str) -> str:
+        context_preview = context_text[:100] if context_text else "No context"
         return f"[OpenAI] Answer for '{question}' based on: {context_preview}..."
 
 
 class GeminiProvider(LLMProvider):
     """Adapter for Google Gemini API (simulated for demonstration)."""
     
-    def generate_answer(self, question: str, context) -> str:
-        context_preview = str(context)[:100] if context else "No context"
+    def generate_answer(self, question: str, context_text: str) -> str:
+        context_preview = context_text[:100] if context_text else "No context"
         return f"[Gemini] Answer for '{question}' based on: {context_preview}..."
@@ -10,13 +10,15 @@ Provides multiple retrieval strategies that can be swapped at runtime:
 
 from abc import ABC, abstractmethod
 
+from models import QueryContext
+
 
 class RetrievalStrategy(ABC):
     """Abstract base class for retrieval strategies."""
     
     @abstractmethod
-    def retrieve(self, query: str, content_store) -> list:
-        """Retrieve relevant content for the given query."""
+    def retrieve(self, ctx: QueryContext) -> str:
+        """Retrieve relevant content for the given query as context text."""
         pass
 
 
@@ -26,10 +28,12 @@ class TopNStrategy(RetrievalStrategy):
     def __init__(self, n: int = 3):
         self.n = n
     
-    def retrieve(self, query: str, content_store) -> list:
-        if content_store is None:
-            return []
-        return content_store.find_relevant_chunks(query, self.n)
+    def retrieve(self, ctx: QueryContext) -> str:
+        if ctx.content_store is None:
+            return ""
+        return ctx.content_store.retrieve_context_text(
+            ctx.query, self.n, embedding=ctx.get_embedding()
+        )
 
 
 class WindowStrategy(RetrievalStrategy):
@@ -38,25 +42,31 @@ class WindowStrategy(RetrievalStrategy):
     def __init__(self, window_size: int = 1):
         self.window_size = window_size
     
-    def retrieve(self, query: str, content_store) -> list:
-        if content_store is None:
-            return []
-        return content_store.find_relevant_chunks(query, 3)
+    def retrieve(self, ctx: QueryContext) -> str:
+        if ctx.content_store is None:
+            return ""
+        return ctx.content_store.retrieve_context_text(
+            ctx.query, 3, embedding=ctx.get_embedding()
+        )
 
 
 class DocumentStrategy(RetrievalStrategy):
     """Retrieves entire documents when a relevant chunk is found."""
     
-    def retrieve(self, query: str, content_store) -> list:
-        if content_store is None:
-            return []
-        return content_store.find_relevant_chunks(query, 5)
+    def retrieve(self, ctx: QueryContext) -> str:
+        if ctx.content_store is None:
+            return ""
+        return ctx.content_store.retrieve_context_text(
+            ctx.query, 5, embedding=ctx.get_embedding()
+        )
 
 
 class HierarchicalStrategy(RetrievalStrategy):
     """Uses parent-child structure for precise search with broader context."""
     
-    def retrieve(self, query: str, content_store) -> list:
-        if content_store is None:
-            return []
-        return content_store.find_relevant_chunks(query, 3)
+    def retrieve(self, ctx: QueryContext) -> str:
+        if ctx.content_store is None:
+            return ""
+        return ctx.content_store.retrieve_context_text(
+            ctx.query, 3, embedding=ctx.get_embedding()
+        )
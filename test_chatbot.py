@@ -7,9 +7,74 @@ Tests the three design patterns:
 3. Adapter Pattern - LLM provider swapping
 """
 
-from chatbot import CSEChatbot
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+
+import numpy as np
+
+from chatbot import CSEChatbot, EMBEDDING_MODEL
 from strategies import TopNStrategy, WindowStrategy
 from providers import OllamaProvider, OpenAIProvider
+from cache import SemanticCache
+from handlers import CourseTitleHandler, SemanticHandler
+from models import Course, CourseCatalog, QueryContext
+import fast_sim
+import local_store
+from local_store import LocalContentStore
+from embedding_cache import EmbeddingCache
+
+from rag4p.rag.model.chunk import Chunk
+
+
+class FakeEmbedder:
+    """Embedder returning fixed vectors so retrieval tests run offline."""
+    
+    def embed(self, text: str) -> list:
+        return [1.0, 0.1, 0.0]
+
+
+class VectorEmbedder:
+    """Embedder returning one given vector for any text."""
+    
+    def __init__(self, vector):
+        self._vector = vector
+    
+    def embed(self, text: str) -> list:
+        return self._vector
+
+
+class CountingEmbedder:
+    """Embedder returning text-dependent vectors and counting calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def embed(self, text: str) -> list:
+        self.calls += 1
+        return [1.0, float(len(text) % 7), float(text.count(" "))]
+
+
+def make_offline_bot(tmp: str, embedder) -> CSEChatbot:
+    """Build a chatbot whose course embeddings come from a pre-filled cache."""
+    data_path = os.path.join(tmp, "courses.jsonl")
+    shutil.copy("courses.jsonl", data_path)
+    with open(data_path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    texts = [f"{row['title']}: {row['description']}" for row in rows]
+    cache = EmbeddingCache(os.path.join(tmp, ".emb_cache.sqlite"))
+    cache.get_or_embed(EMBEDDING_MODEL, texts,
+                       lambda batch: [embedder.embed(t) for t in batch])
+    cache.close()
+    
+    bot = CSEChatbot(data_path, warm_up=False)
+    bot.set_provider("openai")
+    bot._embedder = embedder
+    bot._semantic_handler._embedder = embedder
+    embedder.calls = 0
+    return bot
 
 
 def test_chain_of_responsibility():
@@ -61,11 +126,252 @@ def test_adapter_pattern():
     print("  [PASS] Provider swapped to OpenAIProvider")
 
 
+def test_answer_cache():
+    """Test that repeated questions are served from the answer cache."""
+    print("\nTesting Answer Cache...")
+    
+    bot = CSEChatbot("courses.jsonl")
+    
+    response1 = bot.ask("Tell me about course 4361")
+    response2 = bot.ask("  tell me ABOUT course 4361 ")
+    assert response1 == response2
+    assert bot._cache.stats()["hits"] == 1
+    print("  [PASS] Normalized repeat question served from cache")
+    
+    bot.set_provider("openai")
+    assert bot._cache.stats()["entries"] == 0
+    print("  [PASS] Cache cleared on provider change")
+
+
+def test_semantic_cache():
+    """Test that near-duplicate embeddings hit the semantic cache."""
+    print("\nTesting Semantic Cache...")
+    
+    cache = SemanticCache()
+    cache.put([1.0, 0.5, 0.2, 0.1], "cached answer")
+    
+    assert cache.get([1.0, 0.5, 0.2, 0.11]) == "cached answer"
+    print("  [PASS] Near-duplicate embedding served from cache")
+    
+    assert cache.get([-1.0, 0.2, -0.5, 0.3]) is None
+    print("  [PASS] Dissimilar embedding misses the cache")
+    
+    rng = np.random.default_rng(0)
+    hits = 0
+    for _ in range(200):
+        cache = SemanticCache()
+        base = rng.standard_normal(768)
+        noise = rng.standard_normal(768)
+        noise -= (noise @ base) / (base @ base) * base
+        noise *= np.linalg.norm(base) / np.linalg.norm(noise)
+        paraphrase = 0.97 * base + np.sqrt(1 - 0.97 ** 2) * noise
+        cache.put(base, "answer")
+        hits += cache.get(paraphrase) == "answer"
+    assert hits >= 190
+    print("  [PASS] Paraphrases at cosine 0.97 hit the cache")
+    
+    cache = SemanticCache(max_entries=2)
+    for i, vector in enumerate(np.eye(3)):
+        cache.put(vector, f"answer {i}")
+    assert cache.get(np.eye(3)[0]) is None
+    assert cache.get(np.eye(3)[2]) == "answer 2"
+    print("  [PASS] Least recently used entry evicted at capacity")
+    
+    cache.put([1.0, 0.0], "other model")
+    assert cache.get([1.0, 0.0]) == "other model"
+    assert cache.get(np.eye(3)[2]) is None
+    print("  [PASS] Embedding size change resets the cache")
+
+
+def test_embedding_cache():
+    """Test that the embedding cache only embeds texts it has not seen."""
+    print("\nTesting Embedding Cache...")
+    
+    embedded = []
+    
+    def embed(texts):
+        embedded.extend(texts)
+        return [[float(len(text)), 0.1] for text in texts]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(os.path.join(tmp, "emb.sqlite"))
+        cache.get_or_embed("model-a", ["a", "bb"], embed)
+        vectors, misses = cache.get_or_embed("model-a", ["bb", "ccc"], embed)
+        assert embedded == ["a", "bb", "ccc"] and misses == 1
+        print("  [PASS] Only cache misses are embedded")
+        
+        assert vectors[0].dtype == np.float32
+        assert np.allclose(vectors[0], [2.0, 0.1])
+        print("  [PASS] Vectors round-trip as float32")
+        
+        _, misses = cache.get_or_embed("model-b", ["a"], embed)
+        assert misses == 1
+        print("  [PASS] Model change misses the cache")
+        
+        try:
+            cache.get_or_embed("model-a", ["d", "e"], lambda texts: [[1.0]])
+            assert False, "short embedder output was accepted"
+        except ValueError:
+            print("  [PASS] Short embedder output rejected")
+        cache.close()
+    
+    bot = CSEChatbot(os.path.join(tempfile.gettempdir(), "no_such_dir",
+                                  "courses.jsonl"), warm_up=False)
+    assert isinstance(bot.strategy, TopNStrategy)
+    bot.close()
+    print("  [PASS] Unwritable cache location does not stop startup")
+
+
+def test_query_prefetch():
+    """Test that the prefetched query embedding is reused on the semantic path."""
+    print("\nTesting Query Embedding Prefetch...")
+    
+    embedder = CountingEmbedder()
+    with tempfile.TemporaryDirectory() as tmp:
+        bot = make_offline_bot(tmp, embedder)
+        
+        response = bot.ask("Tell me about course 4361")
+        assert "Software Design Patterns" in response
+        assert embedder.calls <= 1
+        print("  [PASS] ID hit answers without waiting on the prefetch")
+        
+        embedder.calls = 0
+        response = bot.ask("Which course covers design patterns?")
+        assert "[OpenAI]" in response
+        assert embedder.calls == 1
+        print("  [PASS] Semantic path reuses the prefetched embedding")
+        
+        bot.close()
+
+
+def test_shared_query_embedding():
+    """Test that the semantic cache and retrieval share one query embedding."""
+    print("\nTesting Shared Query Embedding...")
+    
+    embedder = CountingEmbedder()
+    chunks = [Chunk(str(i), "0", 1, f"chunk {i}", {}) for i in range(3)]
+    store = LocalContentStore(embedder, chunks, np.eye(3))
+    handler = SemanticHandler(strategy=TopNStrategy(), provider=OpenAIProvider(),
+                              embedder=embedder, semantic_cache=SemanticCache())
+    
+    handler.handle(QueryContext("Which course covers design patterns?", store))
+    assert embedder.calls == 1
+    print("  [PASS] One embedding call per question")
+    
+    ctx = QueryContext("Which course covers design patterns?", store,
+                       embedding=embedder.embed("Which course covers design patterns?"))
+    embedder.calls = 0
+    assert handler.handle(ctx).startswith("[OpenAI]")
+    assert embedder.calls == 0
+    print("  [PASS] Semantic cache hit makes no embedding call")
+    
+    prefetch = Future()
+    prefetch.set_result([0.0, 1.0, 0.0])
+    no_embedder = SemanticHandler(strategy=TopNStrategy(),
+                                  provider=OpenAIProvider())
+    ctx = QueryContext("anything", store, prefetch=prefetch)
+    assert "chunk 1" in no_embedder.handle(ctx)
+    assert embedder.calls == 0
+    print("  [PASS] Strategy uses the prefetched embedding")
+
+
+def test_course_title_matching():
+    """Test that the longest matching title wins and titles are escaped."""
+    print("\nTesting Course Title Matching...")
+    
+    catalog = CourseCatalog([
+        Course("1000", "Systems", "Short title."),
+        Course("2000", "Systems Programming", "Long title."),
+        Course("3000", "C++ (Honors)", "Metacharacters."),
+    ])
+    handler = CourseTitleHandler(catalog=catalog)
+    
+    response = handler.handle(QueryContext("Tell me about systems programming"))
+    assert "ID: 2000" in response
+    print("  [PASS] Longest overlapping title wins")
+    
+    response = handler.handle(QueryContext("Is c++ (honors) hard?"))
+    assert "ID: 3000" in response
+    assert "ID:" not in handler.handle(QueryContext("Is cxx honors hard?"))
+    print("  [PASS] Regex metacharacters in titles are matched literally")
+
+
+def test_local_content_store():
+    """Test that the local store ranks chunks by cosine similarity."""
+    print("\nTesting Local Content Store...")
+    
+    chunks = [Chunk(str(i), "0", 1, f"chunk {i}", {}) for i in range(3)]
+    embeddings = [[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+    store = LocalContentStore(FakeEmbedder(), chunks, embeddings)
+    
+    relevant = store.find_relevant_chunks("query", 2)
+    assert [chunk.chunk_text for chunk in relevant] == ["chunk 1", "chunk 0"]
+    print("  [PASS] Chunks ranked by cosine similarity")
+    
+    assert store.retrieve_context_text("query", 2) == "chunk 1\nchunk 0"
+    print("  [PASS] Context text joined from top chunks")
+    
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((50, 64))
+    query = embeddings[7] + 0.5 * rng.standard_normal(64)
+    chunks = [Chunk(str(i), "0", 1, f"chunk {i}", {}) for i in range(50)]
+    simsimd = local_store.simsimd
+    try:
+        for backend in (simsimd, None):
+            local_store.simsimd = backend
+            rankings = []
+            for quantize in (True, False):
+                store = LocalContentStore(VectorEmbedder(query), chunks,
+                                          embeddings, quantize=quantize)
+                relevant = store.find_relevant_chunks("query", 5)
+                rankings.append([chunk.chunk_text for chunk in relevant])
+            assert rankings[0] == rankings[1]
+    finally:
+        local_store.simsimd = simsimd
+    print("  [PASS] int8 and float32 paths return the same ranking")
+    
+    expected = [f"chunk {i}" for i in np.argsort(
+        -(embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)) @ query
+    )]
+    store = LocalContentStore(FakeEmbedder(), chunks, embeddings, quantize=False)
+    for n in (3, 5):
+        relevant = store.find_relevant_chunks("query", n, embedding=query)
+        assert [chunk.chunk_text for chunk in relevant] == expected[:n]
+    print("  [PASS] Top 3 and top 5 match a full sort")
+    
+    numba_available = fast_sim.NUMBA_AVAILABLE
+    try:
+        local_store.simsimd = None
+        rankings = []
+        for use_numba in (numba_available, False):
+            fast_sim.NUMBA_AVAILABLE = use_numba
+            store = LocalContentStore(VectorEmbedder(query), chunks,
+                                      embeddings, quantize=False)
+            rankings.append([
+                [chunk.chunk_text for chunk in store.find_relevant_chunks(
+                    "query", n
+                )]
+                for n in (1, 3, 5, 50)
+            ])
+        assert rankings[0] == rankings[1]
+    finally:
+        local_store.simsimd = simsimd
+        fast_sim.NUMBA_AVAILABLE = numba_available
+    print("  [PASS] Numba float32 path matches the numpy ranking")
+
+
 if __name__ == "__main__":
     try:
         test_chain_of_responsibility()
         test_strategy_pattern()
         test_adapter_pattern()
+        test_answer_cache()
+        test_semantic_cache()
+        test_embedding_cache()
+        test_query_prefetch()
+        test_shared_query_embedding()
+        test_course_title_matching()
+        test_local_content_store()
         print("\n" + "=" * 40)
         print("ALL TESTS PASSED!")
         print("=" * 40)